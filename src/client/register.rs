@@ -1,27 +1,51 @@
 use serde::Serialize;
-use tracing::{info, error};
-use reqwest::Client;
+use tracing::{info, debug, warn, error};
+use reqwest::{header::CONTENT_TYPE, Client};
+use std::sync::OnceLock;
 use std::time::{SystemTime, UNIX_EPOCH};
 use crate::utils::conf_helper;
 
+// Shared by registration and heartbeat so the keep-alive connection to
+// Plotune Core is reused instead of reconnecting on every request.
+static HTTP_CLIENT: OnceLock<Client> = OnceLock::new();
+
+fn http_client() -> &'static Client {
+    HTTP_CLIENT.get_or_init(|| {
+        Client::builder()
+            .pool_max_idle_per_host(2)
+            .build()
+            .expect("HTTP client init failed")
+    })
+}
+
 #[derive(Serialize)]
 pub struct HealthPayload {
     pub id: String,
     pub timestamp: f64,
 }
 
-use tokio::time::{sleep, Duration};
+use tokio::time::{interval, sleep, Duration, MissedTickBehavior};
+
+const REGISTER_MAX_ATTEMPTS: u32 = 5;
+const REGISTER_BACKOFF_BASE: Duration = Duration::from_secs(1);
+const REGISTER_BACKOFF_MAX: Duration = Duration::from_secs(30);
 
 pub async fn start_heartbeat() {
     let config = conf_helper::get_cached_config();
     let core_url = conf_helper::get_core_url();
 
     let heartbeat_url = format!("http://{}/heartbeat", core_url);
-    let client = Client::new();
+    let client = http_client();
 
     info!("Heartbeat worker started for ID: {}", config.id);
 
+    // Fixed cadence: time spent on the request does not push the next beat out
+    let mut ticker = interval(Duration::from_secs(15));
+    ticker.set_missed_tick_behavior(MissedTickBehavior::Delay);
+
     loop {
+        ticker.tick().await;
+
         let payload = HealthPayload {
             id: config.id.clone(),
             timestamp: SystemTime::now()
@@ -38,38 +62,62 @@ pub async fn start_heartbeat() {
 
         match result {
             Ok(resp) if resp.status().is_success() => {
-                info!("Heartbeat sent successfully");
+                debug!("Heartbeat sent successfully");
             }
             Ok(resp) => error!("Heartbeat server error: {}", resp.status()),
             Err(e) => error!("Heartbeat network error: {}", e),
         }
-
-        sleep(Duration::from_secs(15)).await;
     }
 }
 
 
 pub async fn register() -> Result<(), String> {
-    let config = conf_helper::get_cached_config();
     let core_url = conf_helper::get_core_url();
 
     let register_url = format!("http://{}/register", core_url);
-    let client = Client::new();
+    let client = http_client();
 
     info!("Registering to Plotune Core: {}", register_url);
 
-    client
-        .post(&register_url)
-        .json(config)
-        .send()
-        .await
-        .map_err(|e| {
-            error!("Registration failed: {}", e);
-            format!("HTTP Error: {}", e)
-        })?
-        .error_for_status()
-        .map_err(|e| format!("Server returned error: {}", e))?;
-
-    info!("Successfully registered to Plotune Core!");
-    Ok(())
+    // Core may still be starting: retry network and 5xx failures with
+    // exponential backoff, but give up at once when Core rejects us (4xx).
+    let mut last_error = String::new();
+    for attempt in 0..REGISTER_MAX_ATTEMPTS {
+        if attempt > 0 {
+            let backoff = REGISTER_BACKOFF_BASE * 2u32.pow(attempt - 1);
+            let backoff = backoff.min(REGISTER_BACKOFF_MAX);
+            warn!(
+                "Registration attempt {}/{} failed, retrying in {:?}",
+                attempt, REGISTER_MAX_ATTEMPTS, backoff
+            );
+            sleep(backoff).await;
+        }
+
+        let result = client
+            .post(&register_url)
+            .header(CONTENT_TYPE, "application/json")
+            .body(conf_helper::get_config_json())
+            .send()
+            .await;
+
+        match result {
+            Ok(resp) if resp.status().is_success() => {
+                info!("Successfully registered to Plotune Core!");
+                return Ok(());
+            }
+            Ok(resp) if resp.status().is_client_error() => {
+                return Err(format!("Server returned error: {}", resp.status()));
+            }
+            Ok(resp) => {
+                error!("Registration server error: {}", resp.status());
+                last_error = format!("Server returned error: {}", resp.status());
+            }
+            Err(e) => {
+                error!("Registration failed: {}", e);
+                last_error = format!("HTTP Error: {}", e);
+            }
+        }
+    }
+
+    Err(last_error)
 }
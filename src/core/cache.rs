@@ -0,0 +1,130 @@
+// Decoded-chunk cache shared by the reads of one PltxReader
+
+use crate::core::format::TimeseriesChunk;
+use std::collections::{BTreeMap, HashMap};
+use std::sync::Arc;
+
+// Default budget for decoded chunks kept per reader
+pub const DEFAULT_CHUNK_CACHE_BYTES: usize = 64 << 20;
+
+/// LRU cache of decoded chunks keyed by file offset, bounded by the total
+/// size of the cached samples rather than by entry count.
+pub struct ChunkCache {
+    capacity: usize,
+    size: usize,
+    tick: u64,
+    // offset -> (chunk, tick of last use)
+    entries: HashMap<u64, (Arc<TimeseriesChunk>, u64)>,
+    // tick of last use -> offset, least recently used first
+    order: BTreeMap<u64, u64>,
+}
+
+impl ChunkCache {
+    pub fn new(capacity: usize) -> Self {
+        Self {
+            capacity,
+            size: 0,
+            tick: 0,
+            entries: HashMap::new(),
+            order: BTreeMap::new(),
+        }
+    }
+
+    pub fn get(&mut self, offset: u64) -> Option<Arc<TimeseriesChunk>> {
+        let (chunk, last_used) = self.entries.get_mut(&offset)?;
+
+        self.tick += 1;
+        self.order.remove(last_used);
+        self.order.insert(self.tick, offset);
+        *last_used = self.tick;
+
+        Some(Arc::clone(chunk))
+    }
+
+    /// Chunks larger than the whole budget are not cached.
+    pub fn insert(&mut self, offset: u64, chunk: Arc<TimeseriesChunk>) {
+        let bytes = chunk_bytes(&chunk);
+        if bytes > self.capacity {
+            return;
+        }
+
+        if let Some((old, last_used)) = self.entries.remove(&offset) {
+            self.order.remove(&last_used);
+            self.size -= chunk_bytes(&old);
+        }
+
+        self.tick += 1;
+        self.entries.insert(offset, (chunk, self.tick));
+        self.order.insert(self.tick, offset);
+        self.size += bytes;
+
+        while self.size > self.capacity {
+            let Some((_, oldest)) = self.order.pop_first() else {
+                break;
+            };
+            if let Some((old, _)) = self.entries.remove(&oldest) {
+                self.size -= chunk_bytes(&old);
+            }
+        }
+    }
+
+    pub fn len(&self) -> usize {
+        self.entries.len()
+    }
+
+    pub fn is_empty(&self) -> bool {
+        self.entries.is_empty()
+    }
+
+    /// Total size of the cached samples in bytes.
+    pub fn size(&self) -> usize {
+        self.size
+    }
+}
+
+fn chunk_bytes(chunk: &TimeseriesChunk) -> usize {
+    (chunk.timestamps.len() + chunk.values.len()) * std::mem::size_of::<f64>()
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn chunk(samples: usize) -> Arc<TimeseriesChunk> {
+        Arc::new(TimeseriesChunk {
+            timestamps: vec![0.0; samples],
+            values: vec![0.0; samples],
+        })
+    }
+
+    #[test]
+    fn test_chunk_cache_evicts_least_recently_used() {
+        // Room for exactly two 4-sample chunks (64 bytes each)
+        let mut cache = ChunkCache::new(128);
+        cache.insert(10, chunk(4));
+        cache.insert(20, chunk(4));
+
+        // Touch 10 so that 20 becomes the eviction candidate
+        assert!(cache.get(10).is_some());
+        cache.insert(30, chunk(4));
+
+        assert!(cache.get(20).is_none());
+        assert!(cache.get(10).is_some());
+        assert!(cache.get(30).is_some());
+        assert_eq!(cache.len(), 2);
+        assert_eq!(cache.size(), 128);
+    }
+
+    #[test]
+    fn test_chunk_cache_skips_oversized_and_replaces() {
+        let mut cache = ChunkCache::new(128);
+        cache.insert(10, chunk(16));
+        assert!(cache.is_empty());
+
+        cache.insert(10, chunk(2));
+        cache.insert(10, chunk(4));
+        assert_eq!(cache.len(), 1);
+        assert_eq!(cache.size(), 64);
+        assert_eq!(cache.get(10).unwrap().len(), 4);
+    }
+}
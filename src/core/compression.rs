@@ -3,24 +3,54 @@
 use crate::core::constants::CompressionType;
 use crate::core::error::{PltxError, Result};
 use flate2::read::ZlibDecoder;
+use std::borrow::Cow;
 use std::io::Read;
 
-pub fn decompress(data: &[u8], compression: CompressionType) -> Result<Vec<u8>> {
+#[cfg(feature = "zstd")]
+thread_local! {
+    // A zstd context is costly to set up and not thread-safe: create one per
+    // thread on first use and reuse it for every chunk after that.
+    static ZSTD_DCTX: std::cell::RefCell<Option<zstd::bulk::Decompressor<'static>>> =
+        std::cell::RefCell::new(None);
+}
+
+/// `raw_len` is the expected decompressed size (from the chunk header); the
+/// output buffer is allocated once at that size instead of grown while decoding.
+/// Uncompressed data is returned borrowed, without a copy.
+pub fn decompress(
+    data: &[u8],
+    compression: CompressionType,
+    raw_len: usize,
+) -> Result<Cow<'_, [u8]>> {
     match compression {
-        CompressionType::None => Ok(data.to_vec()),
-        
+        CompressionType::None => Ok(Cow::Borrowed(data)),
+
         CompressionType::Zlib => {
-            let mut decoder = ZlibDecoder::new(data);
-            let mut decompressed = Vec::new();
+            // One byte past raw_len is enough for the caller's length check
+            // to reject an oversized stream without inflating all of it
+            let mut decoder = ZlibDecoder::new(data).take(raw_len as u64 + 1);
+            let mut decompressed = Vec::with_capacity(raw_len);
             decoder
                 .read_to_end(&mut decompressed)
                 .map_err(|e| PltxError::DecompressionFailed(format!("Zlib: {}", e)))?;
-            Ok(decompressed)
+            Ok(Cow::Owned(decompressed))
         }
 
         #[cfg(feature = "lz4")]
         CompressionType::Lz4 => {
+            // The block's own size prefix sizes the decoder's output buffer:
+            // it must agree with the already validated raw_len
+            let prefix = data
+                .get(..4)
+                .map(|p| u32::from_le_bytes(p.try_into().unwrap()) as usize);
+            if prefix != Some(raw_len) {
+                return Err(PltxError::DecompressionFailed(
+                    "LZ4: size prefix does not match chunk header".to_string(),
+                ));
+            }
+
             lz4::block::decompress(data, None)
+                .map(Cow::Owned)
                 .map_err(|e| PltxError::DecompressionFailed(format!("LZ4: {}", e)))
         }
 
@@ -31,7 +61,16 @@ pub fn decompress(data: &[u8], compression: CompressionType) -> Result<Vec<u8>>
 
         #[cfg(feature = "zstd")]
         CompressionType::Zstd => {
-            zstd::decode_all(data)
+            ZSTD_DCTX
+                .with(|cell| {
+                    let mut slot = cell.borrow_mut();
+                    let dctx = match slot.as_mut() {
+                        Some(dctx) => dctx,
+                        None => slot.insert(zstd::bulk::Decompressor::new()?),
+                    };
+                    dctx.decompress(data, raw_len)
+                })
+                .map(Cow::Owned)
                 .map_err(|e| PltxError::DecompressionFailed(format!("Zstd: {}", e)))
         }
 
@@ -49,8 +88,9 @@ mod tests {
     #[test]
     fn test_decompress_none() {
         let data = b"hello world";
-        let result = decompress(data, CompressionType::None).unwrap();
-        assert_eq!(result, data);
+        let result = decompress(data, CompressionType::None, data.len()).unwrap();
+        assert!(matches!(result, Cow::Borrowed(_)));
+        assert_eq!(&result[..], data);
     }
 
     #[test]
@@ -64,7 +104,47 @@ mod tests {
         encoder.write_all(original).unwrap();
         let compressed = encoder.finish().unwrap();
 
-        let decompressed = decompress(&compressed, CompressionType::Zlib).unwrap();
-        assert_eq!(decompressed, original);
+        let decompressed = decompress(&compressed, CompressionType::Zlib, original.len()).unwrap();
+        assert_eq!(&decompressed[..], original);
+    }
+
+    #[test]
+    fn test_decompress_zlib_stops_past_raw_len() {
+        use flate2::write::ZlibEncoder;
+        use flate2::Compression;
+        use std::io::Write;
+
+        let mut encoder = ZlibEncoder::new(Vec::new(), Compression::default());
+        encoder.write_all(&[0u8; 4096]).unwrap();
+        let compressed = encoder.finish().unwrap();
+
+        let decompressed = decompress(&compressed, CompressionType::Zlib, 16).unwrap();
+        assert_eq!(decompressed.len(), 17);
+    }
+
+    #[cfg(feature = "lz4")]
+    #[test]
+    fn test_decompress_lz4_checks_size_prefix() {
+        let original = b"hello world";
+        let compressed = lz4::block::compress(original, None, true).unwrap();
+
+        let decompressed = decompress(&compressed, CompressionType::Lz4, original.len()).unwrap();
+        assert_eq!(&decompressed[..], original);
+
+        // A prefix claiming more than the header allows, and no prefix at all
+        let mut oversized = compressed.clone();
+        oversized[..4].copy_from_slice(&i32::MAX.to_le_bytes());
+        assert!(decompress(&oversized, CompressionType::Lz4, original.len()).is_err());
+        assert!(decompress(&compressed[..2], CompressionType::Lz4, original.len()).is_err());
+    }
+
+    #[cfg(feature = "zstd")]
+    #[test]
+    fn test_decompress_zstd() {
+        let original = b"hello world";
+        let compressed = zstd::encode_all(&original[..], 3).unwrap();
+
+        let decompressed = decompress(&compressed, CompressionType::Zstd, original.len()).unwrap();
+        assert_eq!(&decompressed[..], original);
     }
 }
\ No newline at end of file
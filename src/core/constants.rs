@@ -5,6 +5,9 @@ pub const CHUNK_MAGIC: &[u8; 4] = b"CHNK";
 pub const INDEX_MAGIC: &[u8; 4] = b"IDXT";
 pub const FOOTER_MAGIC: &[u8; 4] = b"FTER";
 
+// File extension of PLTX recordings (compared case-insensitively)
+pub const FILE_EXTENSION: &str = "pltx";
+
 // Compression codes
 #[repr(u8)]
 #[derive(Debug, Clone, Copy, PartialEq, Eq)]
@@ -30,6 +33,10 @@ impl CompressionType {
 // Record format: (timestamp: f64, value: f64)
 pub const RECORD_SIZE: usize = 16; // 8 + 8 bytes
 
+// Largest decompressed chunk accepted; writers emit a few thousand records
+// (tens of KiB) per chunk, so anything near this means a corrupt header
+pub const MAX_CHUNK_RAW_SIZE: usize = 64 << 20;
+
 // Chunk header: signal_id(u32) n(u32) raw_len(u32) comp_len(u32) min_ts(f64) max_ts(f64)
 pub const CHUNK_HEADER_SIZE: usize = 4 + 4 + 4 + 4 + 8 + 8; // 32 bytes
 
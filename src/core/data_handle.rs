@@ -1,93 +1,206 @@
 use axum::extract::ws::{WebSocket, Message};
+use futures_util::SinkExt;
 use serde::Serialize;
 use std::sync::Arc;
+use tokio::sync::mpsc;
+use tokio::sync::mpsc::error::TryRecvError;
 use tracing::{info, warn, error};
 
+use crate::core::error::Result;
+use crate::core::format::TimeseriesChunk;
 use crate::core::reader::PltxReader;
 
+// Encoded frames buffered between the reader thread and the socket
+const FRAME_QUEUE_DEPTH: usize = 4;
+
+// Samples gathered from consecutive chunks before a frame is sent
+const FRAME_TARGET_SAMPLES: usize = 2048;
+
+/// One WebSocket frame: a batch of samples from consecutive chunks,
+/// `seq_start` being the sequence number of the first sample in the frame.
 #[derive(Serialize)]
-struct SignalPayload {
-    timestamp: f64,
-    value: f64,
-    desc: String,
-    seq: u64,
+struct FramePayload<'a> {
+    seq_start: u64,
+    timestamps: &'a [f64],
+    values: &'a [f64],
+    desc: &'a str,
     end_flag: bool,
 }
 
+// Upper bound of a serialized f64 (24 chars, e.g. "-2.2250738585072014e-308")
+// plus its separator
+const MAX_F64_JSON_LEN: usize = 25;
+
+/// Serializes a frame into a buffer sized for the worst case up front, so the
+/// encoder never has to grow and re-copy it mid-frame.
+fn encode_frame(payload: &FramePayload) -> serde_json::Result<String> {
+    let samples = payload.timestamps.len() + payload.values.len();
+    let mut buf = Vec::with_capacity(128 + samples * MAX_F64_JSON_LEN);
+    serde_json::to_writer(&mut buf, payload)?;
+
+    Ok(String::from_utf8(buf).expect("serde_json writes valid UTF-8"))
+}
+
+/// Turns a signal's chunks into encoded frames, one frame per call, so that
+/// only the read/decode/encode step occupies a blocking-pool thread.
+struct FrameProducer {
+    reader: Arc<PltxReader>,
+    signal_id: u32,
+    next_chunk: usize,
+    buf: Vec<u8>,
+    frame: TimeseriesChunk,
+    seq: u64,
+    done: bool,
+}
+
+impl FrameProducer {
+    fn new(reader: Arc<PltxReader>, signal_id: u32) -> Self {
+        Self {
+            reader,
+            signal_id,
+            next_chunk: 0,
+            buf: Vec::new(),
+            frame: TimeseriesChunk::with_capacity(FRAME_TARGET_SAMPLES),
+            seq: 0,
+            done: false,
+        }
+    }
+
+    /// Reads chunks until a frame is full or the signal ends, and encodes
+    /// it. Once the chunks run out the end-flag frame follows; after that, or
+    /// after an error, returns None.
+    fn next_frame(&mut self) -> Option<Result<String>> {
+        if self.done {
+            return None;
+        }
+
+        let result = self.fill_frame().and_then(|()| {
+            // Nothing left to read: this is the end-flag frame
+            let end_flag = self.frame.is_empty();
+            self.done = end_flag;
+            self.encode(end_flag)
+        });
+
+        if result.is_err() {
+            self.done = true;
+        }
+        Some(result)
+    }
+
+    // Chunks are often only a few dozen samples: coalesce consecutive
+    // chunks so each WebSocket frame carries a meaningful batch
+    fn fill_frame(&mut self) -> Result<()> {
+        let entries = self.reader.signal_index(self.signal_id)?;
+
+        while self.frame.len() < FRAME_TARGET_SAMPLES {
+            let Some(entry) = entries.get(self.next_chunk) else {
+                break;
+            };
+            self.reader.append_chunk(entry, &mut self.buf, &mut self.frame)?;
+            self.next_chunk += 1;
+        }
+
+        Ok(())
+    }
+
+    /// Encodes the current frame, then clears it so its buffers are reused
+    /// for the next one.
+    fn encode(&mut self, end_flag: bool) -> Result<String> {
+        let payload = FramePayload {
+            seq_start: self.seq,
+            timestamps: &self.frame.timestamps,
+            values: &self.frame.values,
+            desc: "",
+            end_flag,
+        };
+        let json = encode_frame(&payload)?;
+
+        self.seq += self.frame.len() as u64;
+        self.frame.timestamps.clear();
+        self.frame.values.clear();
+
+        Ok(json)
+    }
+}
+
 pub async fn handle_ws_fetch(
     mut socket: WebSocket,
-    reader: Arc<tokio::sync::Mutex<PltxReader>>,
-    signal_name: String,
+    reader: Arc<PltxReader>,
+    signal_id: u32,
+    signal_name: &str,
 ) {
     info!("ws_fetch streaming started: {}", signal_name);
 
-    let mut seq: u64 = 0;
+    // File reads, decompression and JSON encoding are blocking CPU work: run
+    // each frame's share on the blocking pool and hand finished frames over a
+    // small bounded channel, so preparing the next frame overlaps with sending
+    // this one. Waiting on a full channel is async, so a client that stops
+    // reading holds no blocking-pool thread.
+    let (tx, mut rx) = mpsc::channel::<Result<String>>(FRAME_QUEUE_DEPTH);
+    tokio::spawn(async move {
+        let mut producer = FrameProducer::new(reader, signal_id);
 
-    // 🔒 Lock the reader briefly to get signal ID and read chunks
-    let chunks = {
-        let reader_guard = reader.lock().await;
+        loop {
+            let step = tokio::task::spawn_blocking(move || {
+                let frame = producer.next_frame();
+                (producer, frame)
+            });
 
-        // Get signal ID
-        let signal_id = match reader_guard.get_signal_id_by_name(&signal_name) {
-            Some(id) => id,
-            None => {
-                error!("signal id not found: {}", signal_name);
+            let frame = match step.await {
+                Ok((p, Some(frame))) => {
+                    producer = p;
+                    frame
+                }
+                Ok((_, None)) => return,
+                Err(e) => {
+                    error!("ws_fetch producer failed: {}", e);
+                    return;
+                }
+            };
+
+            // Receiver gone means the socket was closed: stop reading
+            if tx.send(frame).await.is_err() {
                 return;
             }
-        };
+        }
+    });
 
-        // Read all chunks at once
-        match reader_guard.read_signal_chunks(signal_id) {
-            Ok(chunks) => chunks,
+    let mut next = rx.recv().await;
+    while let Some(json) = next {
+        let json = match json {
+            Ok(json) => json,
             Err(e) => {
-                error!("read_signal_chunks failed: {}", e);
+                error!("ws_fetch failed for {}: {}", signal_name, e);
                 return;
             }
+        };
+
+        // Queue the frame without flushing; back-to-back frames then go out
+        // in one write instead of one syscall each
+        if let Err(e) = socket.feed(Message::Text(json.into())).await {
+            warn!("ws send failed: {}", e);
+            return;
         }
-    }; // Lock is released here
-
-    // Iterate through chunks
-    for chunk in chunks {
-
-        // Send each point in the chunk
-        for i in 0..chunk.len() {
-            let payload = SignalPayload {
-                timestamp: chunk.timestamps[i],
-                value: chunk.values[i],
-                desc: String::new(),
-                seq,
-                end_flag: false,
-            };
 
-            let json = match serde_json::to_string(&payload) {
-                Ok(j) => j,
-                Err(e) => {
-                    error!("json serialize error: {}", e);
+        // Flush only once the producer has nothing else ready
+        next = match rx.try_recv() {
+            Ok(json) => Some(json),
+            Err(TryRecvError::Empty) => {
+                if let Err(e) = socket.flush().await {
+                    warn!("ws flush failed: {}", e);
                     return;
                 }
-            };
-
-            if let Err(e) = socket.send(Message::Text(json.into())).await {
-                warn!("ws send failed: {}", e);
-                return;
+                rx.recv().await
             }
-
-            seq += 1;
-        }
+            Err(TryRecvError::Disconnected) => None,
+        };
     }
 
-    // 🔚 END FLAG
-    let end_payload = SignalPayload {
-        timestamp: 0.0,
-        value: 0.0,
-        desc: String::new(),
-        seq,
-        end_flag: true,
-    };
-
-    if let Ok(json) = serde_json::to_string(&end_payload) {
-        let _ = socket.send(Message::Text(json.into())).await;
+    // Push out whatever is still queued, the end flag included
+    if let Err(e) = socket.flush().await {
+        warn!("ws flush failed: {}", e);
+        return;
     }
 
     info!("ws_fetch finished: {}", signal_name);
-}
\ No newline at end of file
+}
@@ -32,4 +32,7 @@ pub enum PltxError {
 
     #[error("Parse error: {0}")]
     ParseError(String),
+
+    #[error("JSON error: {0}")]
+    Json(#[from] serde_json::Error),
 }
\ No newline at end of file
@@ -1,5 +1,6 @@
 // Data structures for PLTX format
 
+use crate::core::constants::{CHUNK_HEADER_SIZE, INDEX_ENTRY_SIZE};
 use serde::{Deserialize, Serialize};
 use std::collections::HashMap;
 
@@ -40,6 +41,21 @@ pub struct ChunkHeader {
     pub max_timestamp: f64,
 }
 
+impl ChunkHeader {
+    /// Decodes the little-endian on-disk layout. The input length is fixed by
+    /// the type, so callers check it once instead of per field.
+    pub fn from_bytes(buf: &[u8; CHUNK_HEADER_SIZE]) -> Self {
+        Self {
+            signal_id: u32::from_le_bytes(field(buf, 0)),
+            record_count: u32::from_le_bytes(field(buf, 4)),
+            raw_length: u32::from_le_bytes(field(buf, 8)),
+            compressed_length: u32::from_le_bytes(field(buf, 12)),
+            min_timestamp: f64::from_le_bytes(field(buf, 16)),
+            max_timestamp: f64::from_le_bytes(field(buf, 24)),
+        }
+    }
+}
+
 #[derive(Debug, Clone)]
 pub struct IndexEntry {
     pub signal_id: u32,
@@ -48,6 +64,24 @@ pub struct IndexEntry {
     pub max_timestamp: f64,
 }
 
+impl IndexEntry {
+    /// Decodes the little-endian on-disk layout of one index table entry.
+    pub fn from_bytes(buf: &[u8; INDEX_ENTRY_SIZE]) -> Self {
+        Self {
+            signal_id: u32::from_le_bytes(field(buf, 0)),
+            offset: u64::from_le_bytes(field(buf, 4)),
+            min_timestamp: f64::from_le_bytes(field(buf, 12)),
+            max_timestamp: f64::from_le_bytes(field(buf, 20)),
+        }
+    }
+}
+
+// N bytes of a fixed-layout record starting at `at`; the bounds are checked
+// at run time and panic if a layout offset is wrong
+fn field<const N: usize>(buf: &[u8], at: usize) -> [u8; N] {
+    buf[at..at + N].try_into().unwrap()
+}
+
 #[derive(Debug, Clone)]
 pub struct TimeseriesChunk {
     pub timestamps: Vec<f64>,
@@ -76,4 +110,43 @@ impl TimeseriesChunk {
     pub fn is_empty(&self) -> bool {
         self.timestamps.is_empty()
     }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_index_entry_from_bytes() {
+        let mut buf = [0u8; INDEX_ENTRY_SIZE];
+        buf[0..4].copy_from_slice(&7u32.to_le_bytes());
+        buf[4..12].copy_from_slice(&1234u64.to_le_bytes());
+        buf[12..20].copy_from_slice(&1.5f64.to_le_bytes());
+        buf[20..28].copy_from_slice(&2.5f64.to_le_bytes());
+
+        let entry = IndexEntry::from_bytes(&buf);
+        assert_eq!(entry.signal_id, 7);
+        assert_eq!(entry.offset, 1234);
+        assert_eq!(entry.min_timestamp, 1.5);
+        assert_eq!(entry.max_timestamp, 2.5);
+    }
+
+    #[test]
+    fn test_chunk_header_from_bytes() {
+        let mut buf = [0u8; CHUNK_HEADER_SIZE];
+        buf[0..4].copy_from_slice(&3u32.to_le_bytes());
+        buf[4..8].copy_from_slice(&64u32.to_le_bytes());
+        buf[8..12].copy_from_slice(&1024u32.to_le_bytes());
+        buf[12..16].copy_from_slice(&200u32.to_le_bytes());
+        buf[16..24].copy_from_slice(&(-1.0f64).to_le_bytes());
+        buf[24..32].copy_from_slice(&9.0f64.to_le_bytes());
+
+        let header = ChunkHeader::from_bytes(&buf);
+        assert_eq!(header.signal_id, 3);
+        assert_eq!(header.record_count, 64);
+        assert_eq!(header.raw_length, 1024);
+        assert_eq!(header.compressed_length, 200);
+        assert_eq!(header.min_timestamp, -1.0);
+        assert_eq!(header.max_timestamp, 9.0);
+    }
 }
\ No newline at end of file
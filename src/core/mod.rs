@@ -1,3 +1,4 @@
+pub mod cache;
 pub mod compression;
 pub mod constants;
 pub mod error;
@@ -1,40 +1,129 @@
 // Main PLTX reader implementation - Thread-safe version
+// Chunk reads are positional, so a shared reader needs no file lock.
 
+use crate::core::cache::{ChunkCache, DEFAULT_CHUNK_CACHE_BYTES};
 use crate::core::compression::decompress;
 use crate::core::constants::*;
 use crate::core::error::{PltxError, Result};
 use crate::core::format::*;
 use std::collections::HashMap;
 use std::fs::File;
-use std::io::{Read, Seek, SeekFrom};
+use std::io::{BufReader, Read, Seek, SeekFrom};
 use std::path::{Path, PathBuf};
-use std::sync::{Arc, Mutex};
+use std::sync::{Arc, Mutex, PoisonError};
+
+/// Per-signal bounds over the chunk list (in file order) that stay monotone
+/// even when chunk time ranges overlap or arrive out of order, so the
+/// candidate chunks of a time range can be found by binary search.
+struct TimeIndex {
+    // running_max[i] = max(max_timestamp of chunks 0..=i), non-decreasing
+    running_max: Vec<f64>,
+    // suffix_min[i] = min(min_timestamp of chunks i..), non-decreasing
+    suffix_min: Vec<f64>,
+}
+
+impl TimeIndex {
+    fn new(entries: &[IndexEntry]) -> Self {
+        let mut running_max = Vec::with_capacity(entries.len());
+        let mut max = f64::NEG_INFINITY;
+        for entry in entries {
+            max = max.max(entry.max_timestamp);
+            running_max.push(max);
+        }
+
+        let mut suffix_min = vec![0.0; entries.len()];
+        let mut min = f64::INFINITY;
+        for (i, entry) in entries.iter().enumerate().rev() {
+            min = min.min(entry.min_timestamp);
+            suffix_min[i] = min;
+        }
+
+        Self { running_max, suffix_min }
+    }
+
+    /// Index range of chunks that may overlap `[start, end]`.
+    fn candidates(&self, start: f64, end: f64) -> std::ops::Range<usize> {
+        // Before `lo` every chunk ends before `start`
+        let lo = self.running_max.partition_point(|&max| max < start);
+        // From `hi` on every chunk starts after `end`
+        let hi = self.suffix_min.partition_point(|&min| min <= end);
+        lo..hi.max(lo)
+    }
+}
 
 #[warn(dead_code)]
 pub struct PltxReader {
     path: PathBuf,
-    file: Arc<Mutex<File>>,
+    file: File,
     header: FileHeader,
     index: HashMap<u32, Vec<IndexEntry>>,
+    time_index: HashMap<u32, TimeIndex>,
+    name_index: HashMap<String, u32>,
+    signal_ids: Vec<u32>,
+    compression: CompressionType,
+    file_len: u64,
+    // None when opened with a zero cache budget
+    chunk_cache: Option<Mutex<ChunkCache>>,
 }
 
 impl PltxReader {
     pub fn open<P: AsRef<Path>>(path: P) -> Result<Self> {
+        Self::open_with_cache(path, DEFAULT_CHUNK_CACHE_BYTES)
+    }
+
+    /// Like [`open`](Self::open), with `cache_bytes` bounding the cache of
+    /// decoded chunks that repeat [`read_time_range`](Self::read_time_range)
+    /// calls are served from. 0 disables the cache.
+    pub fn open_with_cache<P: AsRef<Path>>(path: P, cache_bytes: usize) -> Result<Self> {
         let path = path.as_ref().to_path_buf();
         let mut file = File::open(&path)?;
+        let file_len = file.metadata()?.len();
 
-        let header = Self::read_header(&mut file)?;
+        // Header fields are a few bytes each; parse them from a buffer
+        // rather than issuing a read syscall per field.
+        let header = Self::read_header(&mut BufReader::new(&mut file))?;
         let index = Self::read_footer_and_index(&mut file)?;
 
+        // Parsed once here; also rejects unknown codecs at open time
+        let compression = CompressionType::from_u8(header.compression)
+            .ok_or(PltxError::UnsupportedCompression(header.compression))?;
+        let name_index = Self::build_name_index(&header);
+        let time_index = index
+            .iter()
+            .map(|(id, entries)| (*id, TimeIndex::new(entries)))
+            .collect();
+
+        // Header is immutable: sort the signal IDs once, not per list_signals()
+        let mut signal_ids: Vec<u32> = header.signals.keys().copied().collect();
+        signal_ids.sort_unstable();
+
         Ok(Self {
             path,
-            file: Arc::new(Mutex::new(file)),
+            file,
             header,
             index,
+            time_index,
+            name_index,
+            signal_ids,
+            compression,
+            file_len,
+            chunk_cache: (cache_bytes > 0).then(|| Mutex::new(ChunkCache::new(cache_bytes))),
         })
     }
 
-    fn read_header(file: &mut File) -> Result<FileHeader> {
+    /// Name -> signal ID lookup table. On duplicate names the lowest ID wins.
+    fn build_name_index(header: &FileHeader) -> HashMap<String, u32> {
+        let mut name_index = HashMap::with_capacity(header.signals.len());
+        for (id, meta) in &header.signals {
+            name_index
+                .entry(meta.name.clone())
+                .and_modify(|existing: &mut u32| *existing = (*existing).min(*id))
+                .or_insert(*id);
+        }
+        name_index
+    }
+
+    fn read_header<R: Read>(file: &mut R) -> Result<FileHeader> {
         // Read header prefix
         let mut prefix = [0u8; HEADER_PREFIX_SIZE];
         file.read_exact(&mut prefix)?;
@@ -84,7 +173,7 @@ impl PltxReader {
         })
     }
 
-    fn read_string(file: &mut File) -> Result<String> {
+    fn read_string<R: Read>(file: &mut R) -> Result<String> {
         let mut len_buf = [0u8; 2];
         file.read_exact(&mut len_buf)?;
         let len = u16::from_le_bytes(len_buf) as usize;
@@ -97,7 +186,7 @@ impl PltxReader {
 
     fn read_footer_and_index(file: &mut File) -> Result<HashMap<u32, Vec<IndexEntry>>> {
         // Seek to footer
-        file.seek(SeekFrom::End(-(FOOTER_SIZE as i64)))?;
+        let footer_pos = file.seek(SeekFrom::End(-(FOOTER_SIZE as i64)))?;
 
         let mut footer = [0u8; FOOTER_SIZE];
         file.read_exact(&mut footer)?;
@@ -128,36 +217,32 @@ impl PltxReader {
         file.read_exact(&mut count_buf)?;
         let entry_count = u32::from_le_bytes(count_buf);
 
-        let mut index: HashMap<u32, Vec<IndexEntry>> = HashMap::new();
-        for _ in 0..entry_count {
-            let mut entry_buf = [0u8; INDEX_ENTRY_SIZE];
-            file.read_exact(&mut entry_buf)?;
+        // Read the whole entry table in one go and slice it in memory
+        let table_len = entry_count as u64 * INDEX_ENTRY_SIZE as u64;
+        if index_offset + 8 + table_len > footer_pos {
+            return Err(PltxError::CorruptedData(format!(
+                "Index of {} entries overruns footer",
+                entry_count
+            )));
+        }
 
-            let signal_id = u32::from_le_bytes(entry_buf[0..4].try_into().unwrap());
-            let offset = u64::from_le_bytes(entry_buf[4..12].try_into().unwrap());
-            let min_ts = f64::from_le_bytes(entry_buf[12..20].try_into().unwrap());
-            let max_ts = f64::from_le_bytes(entry_buf[20..28].try_into().unwrap());
+        let mut table = vec![0u8; table_len as usize];
+        file.read_exact(&mut table)?;
 
-            index.entry(signal_id).or_insert_with(Vec::new).push(IndexEntry {
-                signal_id,
-                offset,
-                min_timestamp: min_ts,
-                max_timestamp: max_ts,
-            });
+        let mut index: HashMap<u32, Vec<IndexEntry>> = HashMap::new();
+        for entry_buf in table.chunks_exact(INDEX_ENTRY_SIZE) {
+            let entry = IndexEntry::from_bytes(entry_buf.try_into().unwrap());
+            index.entry(entry.signal_id).or_insert_with(Vec::new).push(entry);
         }
 
         Ok(index)
     }
 
     pub fn list_signals(&self) -> Vec<(u32, &str)> {
-        let mut signals: Vec<_> = self
-            .header
-            .signals
+        self.signal_ids
             .iter()
-            .map(|(id, meta)| (*id, meta.name.as_str()))
-            .collect();
-        signals.sort_by_key(|(id, _)| *id);
-        signals
+            .map(|id| (*id, self.header.signals[id].name.as_str()))
+            .collect()
     }
 
     pub fn get_signal_metadata(&self, signal_id: u32) -> Option<&SignalMetadata> {
@@ -165,11 +250,7 @@ impl PltxReader {
     }
 
     pub fn get_signal_id_by_name(&self, name: &str) -> Option<u32> {
-        self.header
-            .signals
-            .iter()
-            .find(|(_, meta)| meta.name == name)
-            .map(|(id, _)| *id)
+        self.name_index.get(name).copied()
     }
 
     pub fn read_signal_all(&self, signal_id: u32) -> Result<TimeseriesChunk> {
@@ -178,15 +259,13 @@ impl PltxReader {
             .get(&signal_id)
             .ok_or_else(|| PltxError::SignalNotFound(signal_id.to_string()))?;
 
-        let compression = CompressionType::from_u8(self.header.compression)
-            .ok_or(PltxError::UnsupportedCompression(self.header.compression))?;
-
         let mut result = TimeseriesChunk::new();
 
+        let mut buf = Vec::new();
+
+        // Decode every chunk straight into the result, no per-chunk buffers
         for entry in entries {
-            let chunk = self.read_chunk_at(entry.offset, compression)?;
-            result.timestamps.extend(chunk.timestamps);
-            result.values.extend(chunk.values);
+            self.read_chunk_into(entry.offset, &mut buf, &mut result)?;
         }
 
         Ok(result)
@@ -198,19 +277,44 @@ impl PltxReader {
             .get(&signal_id)
             .ok_or_else(|| PltxError::SignalNotFound(signal_id.to_string()))?;
 
-        let compression = CompressionType::from_u8(self.header.compression)
-            .ok_or(PltxError::UnsupportedCompression(self.header.compression))?;
-
         let mut chunks = Vec::new();
+        let mut buf = Vec::new();
 
         for entry in entries {
-            let chunk = self.read_chunk_at(entry.offset, compression)?;
+            let chunk = self.read_chunk_at(entry.offset, &mut buf)?;
             chunks.push(chunk);
         }
 
         Ok(chunks)
     }
 
+    /// Index entries of a signal, in file order. Together with
+    /// [`read_chunk`](Self::read_chunk) this lets callers stream a signal
+    /// one chunk at a time instead of materializing all of it.
+    pub fn signal_index(&self, signal_id: u32) -> Result<&[IndexEntry]> {
+        self.index
+            .get(&signal_id)
+            .map(Vec::as_slice)
+            .ok_or_else(|| PltxError::SignalNotFound(signal_id.to_string()))
+    }
+
+    /// `buf` is scratch space for the compressed bytes; pass the same one
+    /// for consecutive calls so it is allocated once, not per chunk.
+    pub fn read_chunk(&self, entry: &IndexEntry, buf: &mut Vec<u8>) -> Result<TimeseriesChunk> {
+        self.read_chunk_at(entry.offset, buf)
+    }
+
+    /// Like [`read_chunk`](Self::read_chunk), but appends the records to
+    /// `out` so several chunks can be gathered into one buffer.
+    pub fn append_chunk(
+        &self,
+        entry: &IndexEntry,
+        buf: &mut Vec<u8>,
+        out: &mut TimeseriesChunk,
+    ) -> Result<()> {
+        self.read_chunk_into(entry.offset, buf, out)
+    }
+
     pub fn read_time_range(
         &self,
         signal_id: u32,
@@ -222,21 +326,30 @@ impl PltxReader {
             .get(&signal_id)
             .ok_or_else(|| PltxError::SignalNotFound(signal_id.to_string()))?;
 
-        let compression = CompressionType::from_u8(self.header.compression)
-            .ok_or(PltxError::UnsupportedCompression(self.header.compression))?;
+        let candidates = self.time_index[&signal_id].candidates(start_time, end_time);
 
         let mut result = TimeseriesChunk::new();
+        let mut partial = TimeseriesChunk::new();
+        let mut buf = Vec::new();
 
-        for entry in entries {
+        for entry in &entries[candidates] {
             // Skip chunks outside time range
             if entry.max_timestamp < start_time || entry.min_timestamp > end_time {
                 continue;
             }
 
-            let chunk = self.read_chunk_at(entry.offset, compression)?;
+            // Chunk lies entirely inside the range: keep every record as is
+            if entry.min_timestamp >= start_time && entry.max_timestamp <= end_time {
+                self.read_chunk_cached(entry.offset, &mut buf, &mut result)?;
+                continue;
+            }
+
+            partial.timestamps.clear();
+            partial.values.clear();
+            self.read_chunk_cached(entry.offset, &mut buf, &mut partial)?;
 
             // Filter records within time range
-            for (ts, val) in chunk.timestamps.iter().zip(chunk.values.iter()) {
+            for (ts, val) in partial.timestamps.iter().zip(partial.values.iter()) {
                 if *ts >= start_time && *ts <= end_time {
                     result.timestamps.push(*ts);
                     result.values.push(*val);
@@ -247,31 +360,100 @@ impl PltxReader {
         Ok(result)
     }
 
-    fn read_chunk_at(&self, offset: u64, compression: CompressionType) -> Result<TimeseriesChunk> {
-        let mut file = self.file.lock().unwrap();
-        
-        file.seek(SeekFrom::Start(offset))?;
+    fn read_chunk_at(&self, offset: u64, buf: &mut Vec<u8>) -> Result<TimeseriesChunk> {
+        let mut chunk = TimeseriesChunk::new();
+        self.read_chunk_into(offset, buf, &mut chunk)?;
+        Ok(chunk)
+    }
+
+    /// Like [`read_chunk_into`](Self::read_chunk_into), but serves repeat
+    /// reads of a chunk from the decoded-chunk cache. Only range queries use
+    /// it: full-signal reads and streaming would just cycle through it.
+    fn read_chunk_cached(
+        &self,
+        offset: u64,
+        buf: &mut Vec<u8>,
+        out: &mut TimeseriesChunk,
+    ) -> Result<()> {
+        let Some(cache) = &self.chunk_cache else {
+            return self.read_chunk_into(offset, buf, out);
+        };
+
+        // Cache contents stay valid even if a holder panicked
+        let cached = cache
+            .lock()
+            .unwrap_or_else(PoisonError::into_inner)
+            .get(offset);
+
+        let chunk = match cached {
+            Some(chunk) => chunk,
+            None => {
+                let mut chunk = TimeseriesChunk::new();
+                self.read_chunk_into(offset, buf, &mut chunk)?;
+
+                let chunk = Arc::new(chunk);
+                cache
+                    .lock()
+                    .unwrap_or_else(PoisonError::into_inner)
+                    .insert(offset, Arc::clone(&chunk));
+                chunk
+            }
+        };
 
-        let mut chunk_magic = [0u8; 4];
-        file.read_exact(&mut chunk_magic)?;
-        if &chunk_magic != CHUNK_MAGIC {
+        out.timestamps.extend_from_slice(&chunk.timestamps);
+        out.values.extend_from_slice(&chunk.values);
+
+        Ok(())
+    }
+
+    /// Decodes the chunk at `offset` and appends its records to `out`,
+    /// reading the compressed bytes into the reusable `buf`.
+    fn read_chunk_into(
+        &self,
+        offset: u64,
+        buf: &mut Vec<u8>,
+        out: &mut TimeseriesChunk,
+    ) -> Result<()> {
+        // Magic and header in one positional read
+        let mut head = [0u8; 4 + CHUNK_HEADER_SIZE];
+        read_exact_at(&self.file, &mut head, offset)?;
+
+        if &head[0..4] != CHUNK_MAGIC {
             return Err(PltxError::CorruptedData(
                 "Invalid chunk magic".to_string(),
             ));
         }
 
-        let mut header_buf = [0u8; CHUNK_HEADER_SIZE];
-        file.read_exact(&mut header_buf)?;
+        let ChunkHeader {
+            record_count,
+            raw_length,
+            compressed_length,
+            ..
+        } = ChunkHeader::from_bytes(head[4..].try_into().unwrap());
+
+        // Header lengths are untrusted and size the allocations below: check
+        // them first so a corrupt file is an error instead of an abort
+        let records_len = record_count as usize * RECORD_SIZE;
+        if raw_length as usize != records_len || records_len > MAX_CHUNK_RAW_SIZE {
+            return Err(PltxError::CorruptedData(format!(
+                "{} records do not match a raw length of {} bytes",
+                record_count, raw_length
+            )));
+        }
 
-        let _signal_id = u32::from_le_bytes(header_buf[0..4].try_into().unwrap());
-        let record_count = u32::from_le_bytes(header_buf[4..8].try_into().unwrap());
-        let raw_length = u32::from_le_bytes(header_buf[8..12].try_into().unwrap());
-        let compressed_length = u32::from_le_bytes(header_buf[12..16].try_into().unwrap());
+        let payload_offset = offset + head.len() as u64;
+        if payload_offset + compressed_length as u64 > self.file_len {
+            return Err(PltxError::CorruptedData(format!(
+                "Chunk at {} overruns end of file",
+                offset
+            )));
+        }
 
-        let mut compressed_data = vec![0u8; compressed_length as usize];
-        file.read_exact(&mut compressed_data)?;
+        buf.clear();
+        buf.resize(compressed_length as usize, 0);
+        read_exact_at(&self.file, buf, payload_offset)?;
 
-        let raw_data = decompress(&compressed_data, compression)?;
+        let raw_data = decompress(buf, self.compression, raw_length as usize)?;
 
         if raw_data.len() != raw_length as usize {
             return Err(PltxError::CorruptedData(format!(
@@ -281,20 +463,160 @@ impl PltxReader {
             )));
         }
 
-        let mut chunk = TimeseriesChunk::with_capacity(record_count as usize);
+        // Fixed-size records: bulk-extend each column from exact-size
+        // iterators instead of bounds-checked per-record pushes
+        let records = raw_data.chunks_exact(RECORD_SIZE);
+        out.timestamps.extend(
+            records
+                .clone()
+                .map(|rec| f64::from_le_bytes(rec[0..8].try_into().unwrap())),
+        );
+        out.values.extend(
+            records.map(|rec| f64::from_le_bytes(rec[8..16].try_into().unwrap())),
+        );
+
+        Ok(())
+    }
+}
 
-        for i in 0..record_count as usize {
-            let offset = i * RECORD_SIZE;
-            let ts = f64::from_le_bytes(raw_data[offset..offset + 8].try_into().unwrap());
-            let val = f64::from_le_bytes(raw_data[offset + 8..offset + 16].try_into().unwrap());
-            chunk.timestamps.push(ts);
-            chunk.values.push(val);
-        }
+/// Reads exactly `buf.len()` bytes at `offset` without touching a shared file
+/// cursor (pread), so concurrent readers need neither a seek nor a lock.
+#[cfg(unix)]
+fn read_exact_at(file: &File, buf: &mut [u8], offset: u64) -> std::io::Result<()> {
+    use std::os::unix::fs::FileExt;
+    file.read_exact_at(buf, offset)
+}
 
-        Ok(chunk)
+#[cfg(windows)]
+fn read_exact_at(file: &File, mut buf: &mut [u8], mut offset: u64) -> std::io::Result<()> {
+    use std::io::ErrorKind;
+    use std::os::windows::fs::FileExt;
+
+    while !buf.is_empty() {
+        match file.seek_read(buf, offset) {
+            Ok(0) => {
+                return Err(std::io::Error::new(
+                    ErrorKind::UnexpectedEof,
+                    "failed to fill whole buffer",
+                ))
+            }
+            Ok(n) => {
+                buf = &mut buf[n..];
+                offset += n as u64;
+            }
+            Err(e) if e.kind() == ErrorKind::Interrupted => {}
+            Err(e) => return Err(e),
+        }
     }
+    Ok(())
 }
 
-// Make PltxReader thread-safe
-unsafe impl Send for PltxReader {}
-unsafe impl Sync for PltxReader {}
\ No newline at end of file
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn entry(min_timestamp: f64, max_timestamp: f64) -> IndexEntry {
+        IndexEntry {
+            signal_id: 1,
+            offset: 0,
+            min_timestamp,
+            max_timestamp,
+        }
+    }
+
+    #[test]
+    fn test_time_index_candidates() {
+        // Second chunk overlaps the first and the third arrives out of order
+        let entries = [
+            entry(0.0, 10.0),
+            entry(5.0, 20.0),
+            entry(2.0, 8.0),
+            entry(30.0, 40.0),
+            entry(50.0, 60.0),
+        ];
+        let index = TimeIndex::new(&entries);
+
+        assert_eq!(index.candidates(0.0, 100.0), 0..5);
+        assert_eq!(index.candidates(21.0, 35.0), 3..4);
+        assert_eq!(index.candidates(3.0, 4.0), 0..3);
+        assert_eq!(index.candidates(41.0, 49.0), 4..4);
+        assert_eq!(index.candidates(70.0, 80.0), 5..5);
+    }
+
+    /// Uncompressed file with one signal and a single chunk whose header
+    /// claims `raw_length` bytes for two records.
+    fn write_single_chunk_file(name: &str, raw_length: u32) -> PathBuf {
+        let mut data = Vec::new();
+        data.extend_from_slice(MAGIC);
+        data.extend_from_slice(&[2, CompressionType::None as u8]);
+        data.extend_from_slice(&0f64.to_le_bytes());
+        data.extend_from_slice(&1u16.to_le_bytes());
+        data.extend_from_slice(&1u32.to_le_bytes());
+        data.extend_from_slice(&[0u8; 8]); // four empty strings
+
+        let chunk_offset = data.len() as u64;
+        data.extend_from_slice(CHUNK_MAGIC);
+        for field in [1u32, 2, raw_length, 2 * RECORD_SIZE as u32] {
+            data.extend_from_slice(&field.to_le_bytes());
+        }
+        data.extend_from_slice(&0f64.to_le_bytes());
+        data.extend_from_slice(&1f64.to_le_bytes());
+        for value in [0f64, 10.0, 1.0, 11.0] {
+            data.extend_from_slice(&value.to_le_bytes());
+        }
+
+        let index_offset = data.len() as u64;
+        data.extend_from_slice(INDEX_MAGIC);
+        data.extend_from_slice(&1u32.to_le_bytes());
+        data.extend_from_slice(&1u32.to_le_bytes());
+        data.extend_from_slice(&chunk_offset.to_le_bytes());
+        data.extend_from_slice(&0f64.to_le_bytes());
+        data.extend_from_slice(&1f64.to_le_bytes());
+
+        data.extend_from_slice(FOOTER_MAGIC);
+        data.extend_from_slice(&index_offset.to_le_bytes());
+
+        let path = std::env::temp_dir()
+            .join(format!("pltx-{}-{}.pltx", name, std::process::id()));
+        std::fs::write(&path, data).unwrap();
+        path
+    }
+
+    #[test]
+    fn test_chunk_raw_length_is_validated() {
+        let path = write_single_chunk_file("valid", 2 * RECORD_SIZE as u32);
+        let reader = PltxReader::open(&path).unwrap();
+        let chunk = reader.read_signal_all(1).unwrap();
+        assert_eq!(chunk.timestamps, [0.0, 1.0]);
+        assert_eq!(chunk.values, [10.0, 11.0]);
+        std::fs::remove_file(&path).unwrap();
+
+        // A corrupt length must be rejected before it sizes any allocation
+        let path = write_single_chunk_file("corrupt", u32::MAX);
+        let reader = PltxReader::open(&path).unwrap();
+        assert!(matches!(
+            reader.read_signal_all(1),
+            Err(PltxError::CorruptedData(_))
+        ));
+        std::fs::remove_file(&path).unwrap();
+    }
+
+    #[test]
+    fn test_time_range_with_and_without_cache() {
+        let path = write_single_chunk_file("cache", 2 * RECORD_SIZE as u32);
+
+        for cache_bytes in [0, DEFAULT_CHUNK_CACHE_BYTES] {
+            let reader = PltxReader::open_with_cache(&path, cache_bytes).unwrap();
+            assert_eq!(reader.chunk_cache.is_some(), cache_bytes > 0);
+
+            // The second read of the boundary chunk is served from the cache
+            for _ in 0..2 {
+                let chunk = reader.read_time_range(1, 0.5, 2.0).unwrap();
+                assert_eq!(chunk.timestamps, [1.0]);
+                assert_eq!(chunk.values, [11.0]);
+            }
+        }
+
+        std::fs::remove_file(&path).unwrap();
+    }
+}
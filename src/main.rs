@@ -1,5 +1,5 @@
-use axum::Router;
-use tracing::{info, Level};
+use axum::{serve::ListenerExt, Router};
+use tracing::{error, info, warn, Level};
 use tracing_subscriber;
 
 mod routes;
@@ -32,17 +32,33 @@ async fn main() {
         config.connection.port
     );
 
-    client::register::register().await.unwrap();
-
+    // Register in the background: the listener is already bound, so the
+    // server can start answering while Plotune Core processes registration.
     tokio::spawn(async {
-        crate::client::register::start_heartbeat().await;
+        if let Err(e) = client::register::register().await {
+            error!("CRITICAL REGISTRATION FAILURE: {}", e);
+            std::process::exit(1);
+        }
+
+        client::register::start_heartbeat().await;
     });
 
     let app = Router::new()
         .merge(routes::info_routes::health_routes())
         .merge(routes::data_routes::data_routes(state.clone()));
 
+    // Frames are written as soon as they are encoded; don't let Nagle hold
+    // them back waiting for the previous one to be acknowledged.
+    let listener = listener.tap_io(|tcp| {
+        if let Err(e) = tcp.set_nodelay(true) {
+            warn!("Failed to set TCP_NODELAY: {}", e);
+        }
+    });
+
     axum::serve(listener, app)
+        .with_graceful_shutdown(routes::info_routes::shutdown_signal())
         .await
         .unwrap();
+
+    info!("Server stopped");
 }
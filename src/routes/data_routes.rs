@@ -12,15 +12,16 @@ use axum::{
 };
 
 use std::sync::Arc;
+use tokio::sync::OnceCell;
 
 use tracing::{info, debug, error};
 use serde::{Serialize, Deserialize};
 
-use crate::state::app_state::AppState;
+use crate::state::app_state::{AppState, OpenFile};
 use pltx_reader::PltxReader;
+use pltx_reader::core::constants::FILE_EXTENSION;
 
 use crate::routes::ws_handler::handle_ws_fetch;
-use std::collections::HashMap;
 
 #[derive(Serialize)]
 pub struct ReaderSummary {
@@ -80,9 +81,71 @@ async fn read_file(
 ) -> Response {
     debug!("Reading file: mode={}, path={}", request.mode, request.path);
 
-    // Open reader ONCE and wrap in Arc<Mutex>
-    let reader = match PltxReader::open(&request.path) {
-        Ok(r) => Arc::new(tokio::sync::Mutex::new(r)),
+    let file_name = request
+        .path
+        .rsplit(['/', '\\'])
+        .next()
+        .unwrap_or("unknown");
+
+    // Reject other formats before touching the filesystem
+    let is_pltx = file_name
+        .rsplit_once('.')
+        .is_some_and(|(_, ext)| ext.eq_ignore_ascii_case(FILE_EXTENSION));
+    if !is_pltx {
+        error!("Unsupported file format: {}", request.path);
+        return StatusCode::UNSUPPORTED_MEDIA_TYPE.into_response();
+    }
+
+    let metadata = match tokio::fs::metadata(&request.path).await {
+        Ok(m) => m,
+        Err(e) => {
+            error!("Failed to open file {}: {}", request.path, e);
+            return StatusCode::INTERNAL_SERVER_ERROR.into_response();
+        }
+    };
+    let modified = metadata.modified().ok();
+    let len = metadata.len();
+
+    // Reuse the reader of an unchanged file, otherwise open it ONCE and share
+    // it in an Arc. Only the map lookup runs under the global lock.
+    let cell = {
+        let mut open_files = state.open_files.lock().await;
+
+        match open_files.get(&request.path) {
+            Some(open) if open.modified == modified && open.len == len => {
+                debug!("Reusing open reader for {}", request.path);
+                open.reader.clone()
+            }
+            _ => {
+                let cell = Arc::new(OnceCell::new());
+                open_files.insert(
+                    request.path.clone(),
+                    OpenFile {
+                        modified,
+                        len,
+                        reader: cell.clone(),
+                    },
+                );
+                cell
+            }
+        }
+    };
+
+    // Concurrent requests for this file wait on its cell, other files are not
+    // held up. Header and index parsing is blocking file I/O: keep it off the
+    // async workers. A failed open leaves the cell empty for the next request.
+    let opened = cell
+        .get_or_try_init(|| async {
+            let path = request.path.clone();
+            match tokio::task::spawn_blocking(move || PltxReader::open(path)).await {
+                Ok(result) => result.map(Arc::new).map_err(|e| e.to_string()),
+                Err(e) => Err(format!("open task failed: {}", e)),
+            }
+        })
+        .await;
+
+    let reader = match opened {
+        Ok(reader) => reader.clone(),
         Err(e) => {
             error!("Failed to open file {}: {}", request.path, e);
             return StatusCode::INTERNAL_SERVER_ERROR.into_response();
@@ -92,61 +155,73 @@ async fn read_file(
     let mut exposed_headers = Vec::new();
     let mut signals = state.signals.write().await;
 
-    // 🔒 Lock the reader to get signal list
     // Convert &str to String to own the data
-    let signal_list: Vec<(u32, String)> = {
-        let reader_guard = reader.lock().await;
-        reader_guard.list_signals()
-            .into_iter()
-            .map(|(id, name)| (id, name.to_string()))
-            .collect()
-    }; // Lock released here
+    let signal_list: Vec<(u32, String)> = reader
+        .list_signals()
+        .into_iter()
+        .map(|(id, name)| (id, name.to_string()))
+        .collect();
+
+    // Header list for /readers, built once here instead of per request
+    let mut original_names: Vec<String> = signal_list
+        .iter()
+        .map(|(_, name)| name.clone())
+        .collect();
+    original_names.sort();
+    original_names.dedup();
+
+    let mut name_suffixes = state.name_suffixes.lock().await;
 
     // Iterate through signal names
-    for (_id, name) in signal_list {
+    for (signal_id, name) in signal_list {
         let base_name = name;  // Already a String now
         let mut final_name = base_name.clone();
 
         // 👇 GLOBAL UNIQUE NAME
+        // Resume from the last suffix handed out for this name instead of
+        // probing _1, _2, ... again on every load of the same file.
         if signals.contains_key(&final_name) {
-            let mut i = 1;
+            let last_suffix = name_suffixes.entry(base_name.clone()).or_insert(0);
             loop {
-                let candidate = format!("{}_{}", base_name, i);
+                *last_suffix += 1;
+                let candidate = format!("{}_{}", base_name, last_suffix);
                 if !signals.contains_key(&candidate) {
                     final_name = candidate;
                     break;
                 }
-                i += 1;
             }
         }
 
-        info!("Register signal: {} (original: {})", final_name, base_name);
+        debug!("Register signal: {} (original: {})", final_name, base_name);
 
         // Store the SignalInfo with both reader and original name
         signals.insert(
             final_name.clone(),
-            crate::state::app_state::SignalInfo {
+            Arc::new(crate::state::app_state::SignalInfo {
                 reader: reader.clone(),
                 original_name: base_name,  // Store the ORIGINAL name from the file
-            },
+                signal_id,
+            }),
         );
 
         exposed_headers.push(final_name);
     }
+    drop(name_suffixes);
+    drop(signals);
 
-    let file_name = request
-        .path
-        .rsplit('/')
-        .next()
-        .unwrap_or("unknown")
-        .to_string();
+    info!("Registered {} signals from {}", exposed_headers.len(), file_name);
+
+    if !original_names.is_empty() {
+        let reader_id = format!("{:x}", Arc::as_ptr(&reader) as usize);
+        state.readers.write().await.insert(reader_id, original_names);
+    }
 
     // Generate UUID for this file
     let file_id = "123".to_string();
 
     Json(FileReadResponse {
         id: file_id,
-        name: file_name,
+        name: file_name.to_string(),
         path: request.path.clone(),
         source: request.path,
         headers: Some(exposed_headers),
@@ -177,9 +252,15 @@ async fn ws_fetch(
         }
     };
 
-    // 🔒 reader will be locked inside the websocket handler
-    ws.on_upgrade(move |socket| {
-        handle_ws_fetch(socket, signal_info.reader, signal_info.original_name)
+    // Everything the stream needs was resolved at read-file time
+    ws.on_upgrade(move |socket| async move {
+        handle_ws_fetch(
+            socket,
+            signal_info.reader.clone(),
+            signal_info.signal_id,
+            &signal_info.original_name,
+        )
+        .await
     })
 }
 
@@ -187,31 +268,16 @@ async fn ws_fetch(
 async fn list_readers(
     State(state): State<AppState>,
 ) -> impl IntoResponse {
-    // signals: HashMap<String, SignalInfo>
-    let signals = state.signals.read().await;
+    let readers = state.readers.read().await;
 
-    // Group by Arc pointer address
-    let mut groups: HashMap<usize, Vec<String>> = HashMap::new();
-
-    for (_key, info) in signals.iter() {
-        // get raw pointer address for grouping
-        let ptr = Arc::as_ptr(&info.reader) as usize;
-        groups.entry(ptr).or_default().push(info.original_name.clone());
-    }
-
-    // Build response
-    let mut out: Vec<ReaderSummary> = Vec::with_capacity(groups.len());
-    for (ptr, mut names) in groups {
-        // unique headers
-        names.sort();
-        names.dedup();
-        let id = format!("{:x}", ptr);
-        out.push(ReaderSummary {
-            id,
-            signals_count: names.len(),
-            headers: names,
-        });
-    }
+    let out: Vec<ReaderSummary> = readers
+        .iter()
+        .map(|(id, headers)| ReaderSummary {
+            id: id.clone(),
+            signals_count: headers.len(),
+            headers: headers.clone(),
+        })
+        .collect();
 
     Json(out)
 }
@@ -222,31 +288,19 @@ async fn reader_headers(
     Path(reader_id): Path<String>,
 ) -> impl IntoResponse {
     // parse hex id
-    let ptr_res = usize::from_str_radix(&reader_id, 16);
-    let ptr = match ptr_res {
+    let ptr = match usize::from_str_radix(&reader_id, 16) {
         Ok(p) => p,
         Err(_) => return StatusCode::BAD_REQUEST.into_response(),
     };
 
-    let signals = state.signals.read().await;
+    let readers = state.readers.read().await;
 
-    // collect headers for matching pointer
-    let mut headers: Vec<String> = Vec::new();
-    for (_k, info) in signals.iter() {
-        if Arc::as_ptr(&info.reader) as usize == ptr {
-            headers.push(info.original_name.clone());
-        }
+    match readers.get(&format!("{:x}", ptr)) {
+        Some(headers) => Json(ReaderHeaders {
+            id: reader_id,
+            headers: headers.clone(),
+        })
+        .into_response(),
+        None => StatusCode::NOT_FOUND.into_response(),
     }
-
-    if headers.is_empty() {
-        return StatusCode::NOT_FOUND.into_response();
-    }
-
-    headers.sort();
-    headers.dedup();
-
-    Json(ReaderHeaders {
-        id: reader_id,
-        headers,
-    }).into_response()
 }
\ No newline at end of file
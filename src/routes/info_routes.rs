@@ -1,13 +1,15 @@
 use axum::{
     routing::get,
     Router,
-    http::StatusCode,
+    http::{header, StatusCode},
     response::{IntoResponse, Response, Html},
     Json,
 };
 
 use tokio::fs;
-use tracing::{debug, error};
+use tokio::sync::Notify;
+use std::time::Duration;
+use tracing::{debug, error, warn};
 use serde::Serialize;
 
 
@@ -34,7 +36,11 @@ pub async fn info_check() -> Response {
     let config = crate::utils::conf_helper::get_cached_config();
 
     debug!("{} requested", config.name);
-    Json(config).into_response()
+    (
+        [(header::CONTENT_TYPE, "application/json")],
+        crate::utils::conf_helper::get_config_json(),
+    )
+        .into_response()
 }
 
 
@@ -68,14 +74,30 @@ async fn health_check() -> Response {
 }
 
 
-async fn stop_process() -> impl IntoResponse {
-    error!("Stop endpoint called, shutting down process");
+static SHUTDOWN: Notify = Notify::const_new();
+
+// How long graceful shutdown may wait for in-flight requests after /stop
+const SHUTDOWN_GRACE: Duration = Duration::from_secs(3);
+
+/// Resolves once /stop has been called; passed to axum's graceful shutdown.
+pub async fn shutdown_signal() {
+    SHUTDOWN.notified().await;
 
-    // log flush için kısa gecikme opsiyonel
+    // Graceful shutdown waits for every open connection; a stuck client
+    // must not keep the extension alive after Core told it to stop
     tokio::spawn(async {
-        tokio::time::sleep(std::time::Duration::from_millis(100)).await;
+        tokio::time::sleep(SHUTDOWN_GRACE).await;
+        warn!("Graceful shutdown timed out, exiting");
         std::process::exit(0);
     });
+}
+
+async fn stop_process() -> impl IntoResponse {
+    error!("Stop endpoint called, shutting down process");
+
+    // Graceful shutdown delivers this response before the server returns,
+    // no fixed delay needed. notify_one keeps the permit if nobody waits yet.
+    SHUTDOWN.notify_one();
 
     StatusCode::OK
 }
@@ -1,25 +1,43 @@
 use std::collections::HashMap;
 use std::sync::Arc;
-use tokio::sync::{RwLock, Mutex};
+use std::time::SystemTime;
+use tokio::sync::{RwLock, Mutex, OnceCell};
 
 use pltx_reader::PltxReader;
 
-#[derive(Clone)]
+// Readers only do positional reads, so they are shared without a lock
 pub struct SignalInfo {
-    pub reader: Arc<Mutex<PltxReader>>,
+    pub reader: Arc<PltxReader>,
     pub original_name: String,  // The actual signal name in the file
+    pub signal_id: u32,         // Resolved once at read-file time
+}
+
+#[derive(Clone)]
+pub struct OpenFile {
+    pub modified: Option<SystemTime>,  // mtime when the reader was opened
+    pub len: u64,                      // file size when the reader was opened
+    pub reader: Arc<OnceCell<Arc<PltxReader>>>,  // set once the open completes
 }
 
 #[derive(Clone)]
 pub struct AppState {
     // Maps unique_name -> SignalInfo (with reader and original name)
-    pub signals: Arc<RwLock<HashMap<String, SignalInfo>>>,
+    pub signals: Arc<RwLock<HashMap<String, Arc<SignalInfo>>>>,
+    // Maps reader id (hex pointer) -> sorted, unique original signal names
+    pub readers: Arc<RwLock<HashMap<String, Vec<String>>>>,
+    // Maps original signal name -> last numeric suffix used to make it unique
+    pub name_suffixes: Arc<Mutex<HashMap<String, usize>>>,
+    // Maps file path -> reader already opened for it
+    pub open_files: Arc<Mutex<HashMap<String, OpenFile>>>,
 }
 
 impl AppState {
     pub fn new() -> Self {
         Self {
             signals: Arc::new(RwLock::new(HashMap::new())),
+            readers: Arc::new(RwLock::new(HashMap::new())),
+            name_suffixes: Arc::new(Mutex::new(HashMap::new())),
+            open_files: Arc::new(Mutex::new(HashMap::new())),
         }
     }
 }
@@ -6,6 +6,7 @@ use tokio::net::TcpListener;
 
 static CONFIG_CACHE: OnceLock<ExtensionConfig> = OnceLock::new();
 static CORE_URL: OnceLock<String> = OnceLock::new();
+static CONFIG_JSON: OnceLock<String> = OnceLock::new();
 
 pub async fn init_config_and_bind() -> Result<TcpListener, String> {
     let file_path = "plugin.json";
@@ -47,6 +48,14 @@ pub async fn init_config_and_bind() -> Result<TcpListener, String> {
         .set(url)
         .map_err(|_| "Core URL already initialized".to_string())?;
 
+    // Config is immutable from here on: serialize it once for /register and /info
+    let json = serde_json::to_string(&config)
+        .map_err(|e| format!("JSON Serialize Error: {e}"))?;
+
+    CONFIG_JSON
+        .set(json)
+        .map_err(|_| "Config JSON already initialized".to_string())?;
+
     CONFIG_CACHE
         .set(config)
         .map_err(|_| "Config already initialized".to_string())?;
@@ -63,3 +72,7 @@ pub fn get_cached_config() -> &'static ExtensionConfig {
 pub fn get_core_url() -> &'static String {
     CORE_URL.get().expect("Core URL not initialized")
 }
+
+pub fn get_config_json() -> &'static str {
+    CONFIG_JSON.get().expect("Config JSON not initialized")
+}